@@ -8,10 +8,21 @@ import os
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
+import orjson
+from pydantic_core._pydantic_core import build_profile
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
+from app.models import (
+    AnalysisRequest,
+    AnalysisResponse,
+    DiagnosisResponse,
+    TreatmentPlan,
+)
 from app.routes import analyze_router
+from app.services import DiagnosisService
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,11 +34,53 @@ else:
     print(f"✓ GOOGLE_API_KEY loaded (starts with: {os.getenv('GOOGLE_API_KEY')[:10]}...)")
 
 
+def _warm_up_models() -> None:
+    """Run the request and response models once before serving traffic.
+    
+    Pydantic builds core schemas when the model classes are defined, so
+    this only exercises the validator and JSON serializer paths used by
+    /analyze so the first real request does not pay for them.
+    """
+    AnalysisRequest.model_validate({
+        "patient_data": {
+            "pain_scale": 0,
+            "subjective": {
+                "chief_complaint": "Warm-up",
+                "symptom_duration": "",
+                "symptom_description": "",
+            },
+            "objective": {"affected_region": ""},
+        }
+    })
+    AnalysisResponse.model_construct(
+        success=True,
+        diagnosis=DiagnosisResponse.model_construct(
+            differential_diagnosis=["Warm-up"],
+            primary_diagnosis="",
+            clinical_reasoning="",
+            treatment_plan=TreatmentPlan.model_construct(
+                acute_phase="",
+                recovery_phase="",
+                maintenance="",
+            ),
+        ),
+    ).model_dump_json()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
     # Startup
     print("PhysioMind CDSS starting up...")
+    # A debug or source build of pydantic-core validates far slower than
+    # the release wheel, so flag it loudly instead of failing silently.
+    if build_profile != "release":
+        print(
+            f"WARNING: pydantic-core is a '{build_profile}' build; install the "
+            "release wheel with `pip install --only-binary=pydantic-core`."
+        )
+    _warm_up_models()
+    app.state.diagnosis_service = DiagnosisService()
     yield
     # Shutdown
     print("PhysioMind CDSS shutting down...")
@@ -63,6 +116,7 @@ app = FastAPI(
         "name": "MIT",
     },
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for frontend access
@@ -73,20 +127,27 @@ app.add_middleware(
         "http://127.0.0.1:3000",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists avoid reflecting the requested method/headers back on
+    # every preflight; max_age lets browsers cache the preflight result.
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
 # Include routers
 app.include_router(analyze_router)
 
 
+# The root payload never changes, so it is serialized once at import.
+_ROOT_BYTES = orjson.dumps({
+    "name": "PhysioMind CDSS API",
+    "version": "0.1.0",
+    "status": "operational",
+    "documentation": "/docs",
+})
+
+
 @app.get("/", tags=["Root"])
-async def root():
+async def root() -> Response:
     """Root endpoint providing API information."""
-    return {
-        "name": "PhysioMind CDSS API",
-        "version": "0.1.0",
-        "status": "operational",
-        "documentation": "/docs",
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
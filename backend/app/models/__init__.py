@@ -13,6 +13,7 @@ from .schemas import (
     AnalysisResponse,
     ErrorResponse,
 )
+from .validation import validate_request_cached, validate_request_json
 
 __all__ = [
     "PatientInput",
@@ -26,4 +27,6 @@ __all__ = [
     "AnalysisRequest",
     "AnalysisResponse",
     "ErrorResponse",
+    "validate_request_cached",
+    "validate_request_json",
 ]
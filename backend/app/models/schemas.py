@@ -5,9 +5,9 @@ providing type safety and validation for the AI workflow.
 """
 
 from enum import Enum
-from typing import Optional
+from typing import Annotated
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RiskLevel(str, Enum):
@@ -18,6 +18,19 @@ class RiskLevel(str, Enum):
     GREEN = "green"
 
 
+# Shared string length constraints, reused across models so each bundle
+# is defined once instead of repeating max_length on every field.
+Short = Annotated[str, Field(max_length=100)]
+Medium = Annotated[str, Field(max_length=500)]
+Long = Annotated[str, Field(max_length=1000)]
+ExtraLong = Annotated[str, Field(max_length=2000)]
+
+
+# Request/response models are never mutated once built and reject unknown
+# fields. Every other setting is left at its pydantic v2 default.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="forbid")
+
+
 class SubjectiveHistory(BaseModel):
     """Patient's subjective history and symptoms.
     
@@ -25,41 +38,36 @@ class SubjectiveHistory(BaseModel):
     including symptom duration, character, and aggravating factors.
     """
 
-    chief_complaint: str = Field(
+    model_config = _MODEL_CONFIG
+
+    chief_complaint: Medium = Field(
         ...,
         description="Primary reason for visit",
         min_length=1,
-        max_length=500,
     )
-    symptom_duration: str = Field(
+    symptom_duration: Short = Field(
         ...,
         description="How long symptoms have been present",
-        max_length=100,
     )
-    symptom_description: str = Field(
+    symptom_description: ExtraLong = Field(
         ...,
         description="Detailed description of symptoms",
-        max_length=2000,
     )
-    aggravating_factors: Optional[str] = Field(
+    aggravating_factors: Medium | None = Field(
         None,
         description="Activities or movements that worsen symptoms",
-        max_length=500,
     )
-    relieving_factors: Optional[str] = Field(
+    relieving_factors: Medium | None = Field(
         None,
         description="Activities or treatments that reduce symptoms",
-        max_length=500,
     )
-    previous_treatments: Optional[str] = Field(
+    previous_treatments: Long | None = Field(
         None,
         description="Previous treatments attempted",
-        max_length=1000,
     )
-    medical_history: Optional[str] = Field(
+    medical_history: Long | None = Field(
         None,
         description="Relevant medical history",
-        max_length=1000,
     )
 
 
@@ -70,44 +78,39 @@ class ObjectiveFindings(BaseModel):
     assessment, including range of motion, strength, and special tests.
     """
 
-    affected_region: str = Field(
+    model_config = _MODEL_CONFIG
+
+    affected_region: Short = Field(
         ...,
         description="Primary body region affected",
-        max_length=100,
     )
-    range_of_motion_notes: Optional[str] = Field(
+    range_of_motion_notes: Long | None = Field(
         None,
         description="Range of motion assessment findings",
-        max_length=1000,
     )
-    strength_assessment: Optional[str] = Field(
+    strength_assessment: Long | None = Field(
         None,
         description="Muscle strength findings",
-        max_length=1000,
     )
-    special_tests: Optional[list[str]] = Field(
+    special_tests: tuple[str, ...] | None = Field(
         None,
         description="Special tests performed and results",
     )
-    posture_observations: Optional[str] = Field(
+    posture_observations: Medium | None = Field(
         None,
         description="Postural assessment notes",
-        max_length=500,
     )
-    gait_analysis: Optional[str] = Field(
+    gait_analysis: Medium | None = Field(
         None,
         description="Gait pattern observations",
-        max_length=500,
     )
-    palpation_findings: Optional[str] = Field(
+    palpation_findings: Medium | None = Field(
         None,
         description="Findings from palpation",
-        max_length=500,
     )
-    neurological_screening: Optional[str] = Field(
+    neurological_screening: Medium | None = Field(
         None,
         description="Neurological screening results",
-        max_length=500,
     )
 
 
@@ -118,7 +121,9 @@ class PatientInput(BaseModel):
     pain assessment for comprehensive clinical evaluation.
     """
 
-    patient_id: Optional[str] = Field(
+    model_config = _MODEL_CONFIG
+
+    patient_id: str | None = Field(
         None,
         description="Optional patient identifier",
         max_length=50,
@@ -131,15 +136,13 @@ class PatientInput(BaseModel):
     )
     subjective: SubjectiveHistory
     objective: ObjectiveFindings
-    imaging_reports: Optional[str] = Field(
+    imaging_reports: ExtraLong | None = Field(
         None,
         description="Summary of any imaging reports (X-ray, MRI, etc.)",
-        max_length=2000,
     )
-    additional_notes: Optional[str] = Field(
+    additional_notes: Long | None = Field(
         None,
         description="Any additional clinical notes",
-        max_length=1000,
     )
 
 
@@ -150,15 +153,15 @@ class Exercise(BaseModel):
     for the treatment plan.
     """
 
-    name: str = Field(
+    model_config = _MODEL_CONFIG
+
+    name: Short = Field(
         ...,
         description="Exercise name",
-        max_length=100,
     )
-    description: Optional[str] = Field(
+    description: Medium | None = Field(
         None,
         description="How to perform the exercise",
-        max_length=500,
     )
     sets: int = Field(
         ...,
@@ -172,18 +175,18 @@ class Exercise(BaseModel):
         le=50,
         description="Number of repetitions per set",
     )
-    hold_seconds: Optional[int] = Field(
+    hold_seconds: int | None = Field(
         None,
         ge=1,
         le=60,
         description="Hold duration in seconds if applicable",
     )
-    frequency: Optional[str] = Field(
+    frequency: str | None = Field(
         None,
         description="How often to perform (e.g., '2x daily')",
         max_length=50,
     )
-    precautions: Optional[str] = Field(
+    precautions: str | None = Field(
         None,
         description="Important precautions or contraindications",
         max_length=200,
@@ -197,16 +200,17 @@ class RiskFlag(BaseModel):
     attention or further investigation.
     """
 
+    model_config = _MODEL_CONFIG
+
     level: RiskLevel = Field(
         ...,
         description="Severity level of the risk flag",
     )
-    description: str = Field(
+    description: Medium = Field(
         ...,
         description="Description of the risk concern",
-        max_length=500,
     )
-    recommended_action: Optional[str] = Field(
+    recommended_action: str | None = Field(
         None,
         description="Recommended follow-up action",
         max_length=300,
@@ -220,27 +224,25 @@ class TreatmentPlan(BaseModel):
     phases for comprehensive rehabilitation planning.
     """
 
-    acute_phase: str = Field(
+    model_config = _MODEL_CONFIG
+
+    acute_phase: Long = Field(
         ...,
         description="Acute phase treatment recommendations (0-2 weeks)",
-        max_length=1000,
     )
-    recovery_phase: str = Field(
+    recovery_phase: Long = Field(
         ...,
         description="Recovery phase treatment recommendations (2-8 weeks)",
-        max_length=1000,
     )
-    maintenance: str = Field(
+    maintenance: Long = Field(
         ...,
         description="Long-term maintenance recommendations",
-        max_length=1000,
     )
-    precautions: Optional[str] = Field(
+    precautions: Medium | None = Field(
         None,
         description="General precautions and contraindications",
-        max_length=500,
     )
-    expected_timeline: Optional[str] = Field(
+    expected_timeline: str | None = Field(
         None,
         description="Expected recovery timeline",
         max_length=200,
@@ -255,6 +257,8 @@ class DiagnosisResponse(BaseModel):
     and suggested exercises.
     """
 
+    model_config = _MODEL_CONFIG
+
     differential_diagnosis: list[str] = Field(
         ...,
         description="List of possible diagnoses in order of likelihood",
@@ -265,10 +269,9 @@ class DiagnosisResponse(BaseModel):
         description="Most likely diagnosis based on findings",
         max_length=200,
     )
-    clinical_reasoning: str = Field(
+    clinical_reasoning: ExtraLong = Field(
         ...,
         description="Explanation of diagnostic reasoning",
-        max_length=2000,
     )
     risk_flags: list[RiskFlag] = Field(
         default_factory=list,
@@ -282,17 +285,15 @@ class DiagnosisResponse(BaseModel):
         default_factory=list,
         description="List of suggested therapeutic exercises",
     )
-    prognosis: Optional[str] = Field(
+    prognosis: Medium | None = Field(
         None,
         description="Expected outcome with treatment",
-        max_length=500,
     )
-    follow_up_recommendations: Optional[str] = Field(
+    follow_up_recommendations: Medium | None = Field(
         None,
         description="Recommendations for follow-up care",
-        max_length=500,
     )
-    references: Optional[list[str]] = Field(
+    references: list[str] | None = Field(
         None,
         description="Evidence-based references used in analysis",
     )
@@ -304,6 +305,8 @@ class AnalysisRequest(BaseModel):
     Contains the patient input data for the AI analysis endpoint.
     """
 
+    model_config = _MODEL_CONFIG
+
     patient_data: PatientInput
 
 
@@ -314,6 +317,8 @@ class AnalysisResponse(BaseModel):
     about the analysis process.
     """
 
+    model_config = _MODEL_CONFIG
+
     success: bool = Field(
         ...,
         description="Whether the analysis was successful",
@@ -322,11 +327,11 @@ class AnalysisResponse(BaseModel):
         ...,
         description="The diagnostic response",
     )
-    processing_time_ms: Optional[float] = Field(
+    processing_time_ms: float | None = Field(
         None,
         description="Time taken to process the request in milliseconds",
     )
-    model_version: Optional[str] = Field(
+    model_version: str | None = Field(
         None,
         description="AI model version used for analysis",
     )
@@ -338,6 +343,8 @@ class ErrorResponse(BaseModel):
     Provides consistent error formatting for API responses.
     """
 
+    model_config = _MODEL_CONFIG
+
     success: bool = Field(
         default=False,
         description="Always False for error responses",
@@ -350,7 +357,7 @@ class ErrorResponse(BaseModel):
         ...,
         description="Human-readable error message",
     )
-    details: Optional[dict] = Field(
+    details: dict | None = Field(
         None,
         description="Additional error details",
     )
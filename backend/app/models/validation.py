@@ -0,0 +1,60 @@
+"""Optional cached request validation for PhysioMind CDSS.
+
+Identical request bodies (client retries, repeated re-asks) validate to
+identical models, so validation can be memoized on the raw bytes. The
+saving is only ~10µs per request against an LLM call that takes seconds,
+while the cache keeps recent patient records, which are PHI, in process
+memory. It is therefore off unless ANALYZE_VALIDATION_CACHE=1 is set.
+
+Cached instances are shared between requests. The request models are
+frozen and their only sequence field is a tuple, so the instances cannot
+be modified in place.
+"""
+
+import os
+from functools import lru_cache
+
+from .schemas import AnalysisRequest
+
+# Only bodies smaller than this go through the cache, which keeps the
+# bytes it retains to roughly 1MB.
+MAX_CACHED_BODY_BYTES = 8 * 1024
+
+
+@lru_cache(maxsize=128)
+def validate_request_cached(body: bytes) -> AnalysisRequest:
+    """Validate a raw JSON request body, memoized on its exact bytes.
+
+    Failed validations raise and are therefore never cached.
+
+    Args:
+        body: The raw JSON request body.
+
+    Returns:
+        The validated AnalysisRequest.
+
+    Raises:
+        ValidationError: If the body is not a valid AnalysisRequest.
+    """
+    return AnalysisRequest.model_validate_json(body)
+
+
+def validate_request_json(body: bytes) -> AnalysisRequest:
+    """Validate a raw JSON request body, through the cache when enabled.
+
+    The flag is read on every call rather than at import, so a value
+    loaded from ``.env`` during startup is honoured.
+
+    Args:
+        body: The raw JSON request body.
+
+    Returns:
+        The validated AnalysisRequest.
+
+    Raises:
+        ValidationError: If the body is not a valid AnalysisRequest.
+    """
+    cache_enabled = os.getenv("ANALYZE_VALIDATION_CACHE") == "1"
+    if cache_enabled and len(body) < MAX_CACHED_BODY_BYTES:
+        return validate_request_cached(body)
+    return AnalysisRequest.model_validate_json(body)
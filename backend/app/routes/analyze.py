@@ -5,27 +5,100 @@ patient data and returns AI-generated diagnostic reports.
 """
 
 import time
-from typing import Any
+from email.message import Message
+from typing import AsyncIterator
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
 
 from app.models import (
     AnalysisRequest,
     AnalysisResponse,
     DiagnosisResponse,
     ErrorResponse,
+    validate_request_json,
 )
 from app.services.diagnosis_service import DiagnosisService
 
 router = APIRouter(prefix="/api/v1", tags=["Analysis"])
 
-diagnosis_service = DiagnosisService()
+
+def _elapsed_ms(start: int) -> float:
+    """Return milliseconds since a perf_counter_ns() start, to 2 decimals.
+    
+    Truncates with integer division instead of calling round() on a float.
+    """
+    return (time.perf_counter_ns() - start) // 10_000 / 100
+
+
+def get_diagnosis_service(request: Request) -> DiagnosisService:
+    """Return the DiagnosisService created during application startup."""
+    return request.app.state.diagnosis_service
+
+
+def _is_json_content_type(content_type: str | None) -> bool:
+    """Return whether a Content-Type header is parsed as JSON by FastAPI.
+    
+    Mirrors FastAPI's own body handling: a missing header or any
+    ``application/json`` / ``application/*+json`` type counts as JSON.
+    """
+    if not content_type:
+        return True
+    message = Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
+
+async def get_analysis_request(request: Request) -> AnalysisRequest:
+    """Validate the raw request body as an AnalysisRequest.
+    
+    Non-JSON content types are rejected without being parsed, as FastAPI
+    does for regular body parameters, so a cross-origin ``text/plain``
+    "simple request" cannot trigger an analysis.
+    
+    Raises:
+        RequestValidationError: If the body is not a valid AnalysisRequest,
+            so FastAPI still answers with its standard 422 response.
+    """
+    body = await request.body()
+    if not _is_json_content_type(request.headers.get("content-type")):
+        # The same error FastAPI reports when a model parameter gets raw bytes.
+        raise RequestValidationError([{
+            "type": "model_attributes_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+            "input": body,
+        }])
+    try:
+        return validate_request_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+
+# The body is parsed by get_analysis_request, so document it explicitly.
+_ANALYSIS_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"$ref": "#/components/schemas/AnalysisRequest"},
+            },
+        },
+    },
+}
 
 
 @router.post(
     "/analyze",
-    response_model=AnalysisResponse,
     responses={
         200: {"description": "Successful analysis", "model": AnalysisResponse},
         400: {"description": "Invalid input", "model": ErrorResponse},
@@ -42,12 +115,17 @@ diagnosis_service = DiagnosisService()
     The endpoint uses a RAG pipeline to retrieve relevant medical
     protocols before generating the response.
     """,
+    openapi_extra=_ANALYSIS_REQUEST_BODY,
 )
-async def analyze_patient_data(request: AnalysisRequest) -> Any:
+async def analyze_patient_data(
+    request: AnalysisRequest = Depends(get_analysis_request),
+    diagnosis_service: DiagnosisService = Depends(get_diagnosis_service),
+) -> Response:
     """Process patient data and generate AI-powered diagnosis.
     
     Args:
         request: The analysis request containing patient data.
+        diagnosis_service: The application's shared diagnosis service.
         
     Returns:
         AnalysisResponse with diagnostic information.
@@ -55,7 +133,7 @@ async def analyze_patient_data(request: AnalysisRequest) -> Any:
     Raises:
         HTTPException: For validation errors or service failures.
     """
-    start_time = time.time()
+    start = time.perf_counter_ns()
     
     try:
         # Process the diagnosis using the service
@@ -63,26 +141,131 @@ async def analyze_patient_data(request: AnalysisRequest) -> Any:
             request.patient_data
         )
         
-        processing_time = (time.time() - start_time) * 1000
-        
-        return AnalysisResponse(
+        # The diagnosis has already been validated by the service, so
+        # skip FastAPI's response_model re-validation and let pydantic-core
+        # serialize straight to JSON without a dict intermediate.
+        response = AnalysisResponse.model_construct(
             success=True,
             diagnosis=diagnosis,
-            processing_time_ms=round(processing_time, 2),
+            processing_time_ms=_elapsed_ms(start),
             model_version="gpt-4o-2024-01-25",
         )
+        return Response(
+            content=response.model_dump_json(),
+            media_type="application/json",
+        )
         
-    except ValueError as e:
-        raise HTTPException(
+    except Exception as e:
+        raise _to_http_exception(e)
+
+
+@router.post(
+    "/analyze/stream",
+    responses={
+        200: {
+            "description": "Newline-delimited JSON progress and result events",
+            "content": {"application/x-ndjson": {}},
+        },
+        400: {"description": "Invalid input", "model": ErrorResponse},
+        500: {"description": "Internal server error", "model": ErrorResponse},
+        503: {"description": "AI service unavailable", "model": ErrorResponse},
+    },
+    summary="Analyze patient data and stream progress",
+    description="""
+    Streaming variant of /analyze. Emits newline-delimited JSON events
+    while the AI response is generated: `progress` events with the
+    number of characters received so far, then a single `complete`
+    event carrying the AnalysisResponse. Failures after the stream has
+    started are reported as an `error` event.
+    """,
+)
+async def analyze_patient_data_stream(
+    request: AnalysisRequest,
+    diagnosis_service: DiagnosisService = Depends(get_diagnosis_service),
+) -> StreamingResponse:
+    """Process patient data and stream the AI-powered diagnosis.
+    
+    Args:
+        request: The analysis request containing patient data.
+        diagnosis_service: The application's shared diagnosis service.
+        
+    Returns:
+        StreamingResponse of NDJSON analysis events.
+        
+    Raises:
+        HTTPException: For validation errors or failures before the
+            first event is produced.
+    """
+    start = time.perf_counter_ns()
+    events = diagnosis_service.analyze_stream(request.patient_data)
+    
+    # Pull the first event eagerly so configuration and connection
+    # errors still map to a proper HTTP status code.
+    try:
+        first_event = await anext(events)
+    except Exception as e:
+        raise _to_http_exception(e)
+    
+    def encode(event: int | DiagnosisResponse) -> bytes:
+        if isinstance(event, int):
+            return orjson.dumps({"event": "progress", "received_chars": event}) + b"\n"
+        
+        response = AnalysisResponse.model_construct(
+            success=True,
+            diagnosis=event,
+            processing_time_ms=_elapsed_ms(start),
+            model_version="gpt-4o-2024-01-25",
+        )
+        return (
+            b'{"event":"complete","result":'
+            + response.model_dump_json().encode()
+            + b"}\n"
+        )
+    
+    async def ndjson_events() -> AsyncIterator[bytes]:
+        try:
+            yield encode(first_event)
+            async for event in events:
+                yield encode(event)
+        except Exception as e:
+            yield orjson.dumps({"event": "error", **_to_http_exception(e).detail}) + b"\n"
+        finally:
+            await events.aclose()
+    
+    async def close_events() -> None:
+        await events.aclose()
+    
+    # If the client disconnects, Starlette cancels the response without
+    # closing ndjson_events, which may not even have started. Closing
+    # the service stream afterwards shuts the Gemini stream down
+    # deterministically instead of leaving it to garbage collection.
+    return StreamingResponse(
+        ndjson_events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(close_events),
+    )
+
+
+def _to_http_exception(exc: Exception) -> HTTPException:
+    """Map a diagnosis service failure to an HTTPException.
+    
+    Args:
+        exc: The exception raised while analyzing patient data.
+        
+    Returns:
+        HTTPException with a standardized error detail.
+    """
+    if isinstance(exc, ValueError):
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
                 "success": False,
                 "error_code": "VALIDATION_ERROR",
-                "message": str(e),
+                "message": str(exc),
             },
         )
-    except ConnectionError:
-        raise HTTPException(
+    if isinstance(exc, ConnectionError):
+        return HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
                 "success": False,
@@ -90,19 +273,22 @@ async def analyze_patient_data(request: AnalysisRequest) -> Any:
                 "message": "The AI service is currently unavailable. Please try again later.",
             },
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "success": False,
-                "error_code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred during analysis.",
-                "details": {"error": str(e)} if str(e) else None,
-            },
-        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail={
+            "success": False,
+            "error_code": "INTERNAL_ERROR",
+            "message": "An unexpected error occurred during analysis.",
+            "details": {"error": str(exc)} if str(exc) else None,
+        },
+    )
+
+
+# The health payload never changes, so it is serialized once at import.
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "PhysioMind CDSS"})
 
 
 @router.get("/health", summary="Health check endpoint")
-async def health_check() -> dict[str, str]:
+async def health_check() -> Response:
     """Return service health status."""
-    return {"status": "healthy", "service": "PhysioMind CDSS"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
@@ -4,12 +4,21 @@ This module provides the core diagnosis functionality using
 Google Gemini with structured outputs via Pydantic models.
 """
 
-import json
 import os
-from typing import Optional
+import re
+from contextlib import aclosing
+from functools import lru_cache
+from typing import AsyncIterator
 
 from pydantic import ValidationError
 
+try:
+    import google.generativeai as genai
+    from google.generativeai.types import generation_types
+except ImportError:
+    genai = None
+    generation_types = None
+
 from app.models import (
     DiagnosisResponse,
     Exercise,
@@ -20,58 +29,61 @@ from app.models import (
 )
 
 
-class DiagnosisService:
-    """Service for generating AI-powered diagnoses.
+# Keyword scans used by the mock diagnosis to raise risk flags. Each
+# pattern matches word stems (e.g. "catastrophizing", "nights") in a
+# single pass over the symptom description. "overnight" and "midnight"
+# still count as night pain.
+_RED_FLAG_RE = re.compile(
+    r"\b(?:mid|over)?(night|weight\s*loss|fever|bladder|bowel|saddle)\w*",
+    re.IGNORECASE,
+)
+_YELLOW_FLAG_RE = re.compile(
+    r"\b(fear|avoid|catastroph|depress)\w*",
+    re.IGNORECASE,
+)
+
+# Region-independent protocols returned by the simulated RAG retrieval.
+_BASE_PROTOCOLS = (
+    "Clinical practice guidelines from APTA",
+    "Physiotherapy outcome measures and assessment tools",
+    "Red flag screening protocols for musculoskeletal conditions",
+)
+
+
+def _protocols_for(region: str) -> tuple[str, ...]:
+    """Simulate RAG retrieval of relevant medical protocols.
     
-    Uses Google's Gemini model with structured outputs to generate
-    evidence-based diagnostic reports for physiotherapy patients.
-    """
+    In production, this would query a vector database containing
+    evidence-based physiotherapy protocols and guidelines. It does no
+    I/O yet, so it is a plain function rather than a coroutine.
     
-    def __init__(self):
-        """Initialize the diagnosis service."""
-        self.api_key = os.getenv("GOOGLE_API_KEY")
-        self.model = "gemini-1.5-flash"
-        self._medical_protocols: list[str] = []
+    Args:
+        region: The primary body region affected.
         
-    async def _retrieve_medical_protocols(
-        self, 
-        affected_region: str, 
-        symptoms: str
-    ) -> list[str]:
-        """Simulate RAG retrieval of relevant medical protocols.
-        
-        In production, this would query a vector database containing
-        evidence-based physiotherapy protocols and guidelines.
-        
-        Args:
-            affected_region: The primary body region affected.
-            symptoms: Description of symptoms.
-            
-        Returns:
-            List of relevant medical protocol summaries.
-        """
-        # Simulated RAG retrieval - in production, this would query
-        # a vector database with embeddings of medical literature
-        protocols = [
-            f"Evidence-based guidelines for {affected_region} conditions",
-            "Clinical practice guidelines from APTA",
-            "Physiotherapy outcome measures and assessment tools",
-            "Red flag screening protocols for musculoskeletal conditions",
-        ]
-        return protocols
+    Returns:
+        Tuple of relevant medical protocol summaries.
+    """
+    return (f"Evidence-based guidelines for {region} conditions", *_BASE_PROTOCOLS)
+
+
+@lru_cache(maxsize=256)
+def _build_system_prompt(affected_region: str) -> str:
+    """Build the system prompt with retrieved protocols.
     
-    def _build_system_prompt(self, protocols: list[str]) -> str:
-        """Build the system prompt with retrieved protocols.
-        
-        Args:
-            protocols: List of retrieved medical protocols.
-            
-        Returns:
-            The complete system prompt for the LLM.
-        """
-        protocol_context = "\n".join(f"- {p}" for p in protocols)
+    The retrieved protocols only depend on the affected region, so the
+    fully formatted prompt is cached per region.
+    
+    Args:
+        affected_region: The primary body region affected.
         
-        return f"""You are a clinical decision support system for physiotherapists.
+    Returns:
+        The complete system prompt for the LLM.
+    """
+    protocol_context = "\n".join(
+        f"- {p}" for p in _protocols_for(affected_region)
+    )
+    
+    return f"""You are a clinical decision support system for physiotherapists.
 Your role is to analyze patient assessment data and provide evidence-based
 diagnostic suggestions and treatment plans.
 
@@ -92,6 +104,45 @@ RESPONSE REQUIREMENTS:
 
 Always err on the side of caution with risk flags."""
 
+
+@lru_cache(maxsize=1)
+def _diagnosis_generation_config() -> dict:
+    """Return the Gemini generation config for diagnosis requests.
+    
+    Converting ``DiagnosisResponse`` into a Gemini response schema is
+    expensive and the result never changes, so it is done only once.
+    
+    Returns:
+        A generation config dict with a pre-built response schema.
+    """
+    return generation_types.to_generation_config_dict(
+        genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=DiagnosisResponse,
+            temperature=0.3,
+        )
+    )
+
+
+class DiagnosisService:
+    """Service for generating AI-powered diagnoses.
+    
+    Uses Google's Gemini model with structured outputs to generate
+    evidence-based diagnostic reports for physiotherapy patients.
+    """
+    
+    def __init__(self):
+        """Initialize the diagnosis service.
+        
+        The service is created once during application startup, so the
+        Gemini client is configured here rather than on every request.
+        """
+        self.api_key = os.getenv("GOOGLE_API_KEY")
+        self.model = "gemini-1.5-flash"
+        
+        if self.api_key and genai is not None:
+            genai.configure(api_key=self.api_key)
+        
     def _build_user_prompt(self, patient_data: PatientInput) -> str:
         """Build the user prompt from patient data.
         
@@ -103,7 +154,14 @@ Always err on the side of caution with risk flags."""
         """
         subjective = patient_data.subjective
         objective = patient_data.objective
+        special_tests = (
+            ", ".join(objective.special_tests)
+            if objective.special_tests
+            else "Not performed"
+        )
         
+        # A single f-string compiles to one BUILD_STRING, which is cheaper
+        # than appending the lines to a list and joining them.
         prompt = f"""PATIENT ASSESSMENT DATA
 
 SUBJECTIVE HISTORY:
@@ -122,7 +180,7 @@ OBJECTIVE FINDINGS:
 - Affected Region: {objective.affected_region}
 - Range of Motion: {objective.range_of_motion_notes or 'Not assessed'}
 - Strength: {objective.strength_assessment or 'Not assessed'}
-- Special Tests: {', '.join(objective.special_tests) if objective.special_tests else 'Not performed'}
+- Special Tests: {special_tests}
 - Posture: {objective.posture_observations or 'Not noted'}
 - Gait: {objective.gait_analysis or 'Not assessed'}
 - Palpation: {objective.palpation_findings or 'Not noted'}
@@ -151,70 +209,111 @@ Please analyze this assessment and provide a structured diagnostic report."""
             ConnectionError: If the AI service is unavailable.
             ValueError: If patient data is invalid or API key is missing.
         """
-        # Check for API key first
+        self._check_api_key()
+        
+        # Always call the real API (no mock fallback)
+        return await self._call_gemini(patient_data)
+    
+    async def analyze_stream(
+        self, 
+        patient_data: PatientInput
+    ) -> AsyncIterator[int | DiagnosisResponse]:
+        """Analyze patient data, reporting progress while Gemini streams.
+        
+        Args:
+            patient_data: The patient assessment input data.
+            
+        Yields:
+            The number of characters received so far after each chunk,
+            followed by the parsed DiagnosisResponse.
+            
+        Raises:
+            ConnectionError: If the AI service is unavailable.
+            ValueError: If patient data is invalid or API key is missing.
+        """
+        self._check_api_key()
+        
+        chunks: list[str] = []
+        received = 0
+        # aclosing() closes the Gemini stream as soon as this generator is
+        # closed, e.g. when the client disconnects mid-stream.
+        async with aclosing(self._stream_gemini(patient_data)) as stream:
+            async for text in stream:
+                chunks.append(text)
+                received += len(text)
+                yield received
+        
+        yield self._parse_diagnosis(chunks)
+    
+    def _check_api_key(self) -> None:
+        """Raise ValueError if no Google API key is configured."""
         if not self.api_key:
             raise ValueError(
                 "Google API key not configured. Please set GOOGLE_API_KEY environment variable."
             )
-        
-        # Retrieve relevant medical protocols (RAG simulation)
-        protocols = await self._retrieve_medical_protocols(
-            patient_data.objective.affected_region,
-            patient_data.subjective.symptom_description,
-        )
-        
-        # Always call the real API (no mock fallback)
-        return await self._call_gemini(patient_data, protocols)
     
     async def _call_gemini(
         self, 
-        patient_data: PatientInput, 
-        protocols: list[str]
+        patient_data: PatientInput
     ) -> DiagnosisResponse:
         """Call Google Gemini API with structured outputs.
 
         Args:
             patient_data: The patient assessment input.
-            protocols: Retrieved medical protocols for context.
 
         Returns:
             Parsed DiagnosisResponse from the AI.
             
         Raises:
-            ConnectionError: If the API call fails.
-            ImportError: If google-generativeai is not installed.
+            ConnectionError: If the API call fails or google-generativeai
+                is not installed.
         """
-        try:
-            import google.generativeai as genai
-        except ImportError:
-            raise ImportError(
+        async with aclosing(self._stream_gemini(patient_data)) as stream:
+            chunks = [text async for text in stream]
+        return self._parse_diagnosis(chunks)
+    
+    async def _stream_gemini(
+        self, 
+        patient_data: PatientInput
+    ) -> AsyncIterator[str]:
+        """Stream the raw JSON text of a Gemini structured-output response.
+        
+        Args:
+            patient_data: The patient assessment input.
+            
+        Yields:
+            Text chunks as they arrive from Gemini.
+            
+        Raises:
+            ConnectionError: If the API call fails or google-generativeai
+                is not installed.
+        """
+        if genai is None:
+            raise ConnectionError(
                 "Google Generative AI package not installed. "
                 "Run: pip install google-generativeai"
             )
         
         try:
-            genai.configure(api_key=self.api_key)
-            
-            system_prompt = self._build_system_prompt(protocols)
+            system_prompt = _build_system_prompt(
+                patient_data.objective.affected_region
+            )
             user_prompt = self._build_user_prompt(patient_data)
             
             # Configure the model with structured output
             model = genai.GenerativeModel(
                 model_name=self.model,
                 system_instruction=system_prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
-                    response_schema=DiagnosisResponse,
-                    temperature=0.3,
-                ),
+                generation_config=_diagnosis_generation_config(),
             )
             
-            response = await model.generate_content_async(user_prompt)
-            
-            if not response.text:
-                raise ConnectionError("Empty response from Gemini API")
-            
-            return DiagnosisResponse.model_validate_json(response.text)
+            response = await model.generate_content_async(
+                user_prompt, 
+                stream=True,
+            )
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
             
         except Exception as e:
             error_msg = str(e)
@@ -229,6 +328,28 @@ Please analyze this assessment and provide a structured diagnostic report."""
             else:
                 raise ConnectionError(f"Gemini API error: {error_msg}")
     
+    @staticmethod
+    def _parse_diagnosis(chunks: list[str]) -> DiagnosisResponse:
+        """Validate the accumulated Gemini output as a DiagnosisResponse.
+        
+        Args:
+            chunks: Text chunks received from Gemini, in order.
+            
+        Returns:
+            The parsed DiagnosisResponse.
+            
+        Raises:
+            ConnectionError: If the response is empty or does not match
+                the DiagnosisResponse schema.
+        """
+        if not chunks:
+            raise ConnectionError("Empty response from Gemini API")
+        
+        try:
+            return DiagnosisResponse.model_validate_json("".join(chunks))
+        except ValidationError as e:
+            raise ConnectionError(f"Gemini API error: {e}")
+    
     def _generate_mock_diagnosis(
         self, 
         patient_data: PatientInput
@@ -240,6 +361,9 @@ Please analyze this assessment and provide a structured diagnostic report."""
             
         Returns:
             A realistic mock DiagnosisResponse.
+        
+        All models are built with ``model_construct`` because their
+        contents come from trusted, hard-coded values.
         """
         region = patient_data.objective.affected_region.lower()
         pain_level = patient_data.pain_scale
@@ -248,24 +372,40 @@ Please analyze this assessment and provide a structured diagnostic report."""
         risk_flags = []
         if pain_level >= 8:
             risk_flags.append(
-                RiskFlag(
+                RiskFlag.model_construct(
                     level=RiskLevel.YELLOW,
                     description="High pain level may indicate acute condition",
                     recommended_action="Monitor closely and consider pain management referral",
                 )
             )
         
-        if "night" in patient_data.subjective.symptom_description.lower():
+        description = patient_data.subjective.symptom_description
+        
+        red_flag = _RED_FLAG_RE.search(description)
+        if red_flag:
+            # Report the fixed keyword, not the matched word, so the
+            # description stays bounded and free of user-supplied text.
+            red_flag_term = " ".join(red_flag.group(1).lower().split())
             risk_flags.append(
-                RiskFlag(
+                RiskFlag.model_construct(
                     level=RiskLevel.RED,
-                    description="Night pain reported - rule out serious pathology",
+                    description=f"Red flag symptom reported ({red_flag_term}) "
+                        "- rule out serious pathology",
                     recommended_action="Recommend medical evaluation to exclude red flags",
                 )
             )
         
+        if _YELLOW_FLAG_RE.search(description):
+            risk_flags.append(
+                RiskFlag.model_construct(
+                    level=RiskLevel.YELLOW,
+                    description="Psychosocial factors reported that may delay recovery",
+                    recommended_action="Address beliefs and consider psychological referral",
+                )
+            )
+        
         exercises = [
-            Exercise(
+            Exercise.model_construct(
                 name="Gentle Range of Motion",
                 description=f"Gentle active movements of the {region}",
                 sets=2,
@@ -273,7 +413,7 @@ Please analyze this assessment and provide a structured diagnostic report."""
                 frequency="2-3 times daily",
                 precautions="Stop if pain increases significantly",
             ),
-            Exercise(
+            Exercise.model_construct(
                 name="Isometric Strengthening",
                 description="Hold muscle contraction without movement",
                 sets=3,
@@ -282,7 +422,7 @@ Please analyze this assessment and provide a structured diagnostic report."""
                 frequency="Daily",
                 precautions="Maintain neutral spine position",
             ),
-            Exercise(
+            Exercise.model_construct(
                 name="Stretching Program",
                 description=f"Targeted stretches for {region} musculature",
                 sets=2,
@@ -293,7 +433,7 @@ Please analyze this assessment and provide a structured diagnostic report."""
             ),
         ]
         
-        treatment_plan = TreatmentPlan(
+        treatment_plan = TreatmentPlan.model_construct(
             acute_phase=f"Focus on pain management and protection of {region}. "
                 "Apply ice/heat as appropriate. Limit aggravating activities. "
                 "Consider manual therapy for pain relief.",
@@ -308,7 +448,7 @@ Please analyze this assessment and provide a structured diagnostic report."""
             expected_timeline="6-12 weeks for full recovery with compliance",
         )
         
-        return DiagnosisResponse(
+        return DiagnosisResponse.model_construct(
             differential_diagnosis=[
                 f"{region.title()} strain/sprain",
                 f"{region.title()} mechanical dysfunction",
@@ -0,0 +1,44 @@
+"""Deterministic payload builders for PhysioMind tests.
+
+Builders draw from a caller-supplied ``random.Random`` so a given seed
+always yields the same payload, while input size stays a parameter.
+"""
+
+import random
+
+# Seed shared by every test module, so each run builds the same payloads.
+PAYLOAD_SEED = 42
+
+_COMPLAINTS = ("Lower back pain", "Neck pain", "Knee pain", "Shoulder pain")
+_DURATIONS = ("3 days", "2 weeks", "1 month", "6 months")
+_REGIONS = ("Lumbar spine", "Cervical spine", "Right knee", "Left shoulder")
+_TESTS = ("SLR", "Slump", "Lachman", "Hawkins-Kennedy", "Spurling", "FABER")
+_RESULTS = ("positive", "negative", "equivocal")
+
+
+def make_patient(rng: random.Random, n_tests: int = 1) -> dict:
+    """Build a valid PatientInput payload.
+
+    Args:
+        rng: Source of randomness; seed it for reproducible payloads.
+        n_tests: Number of special tests recorded in the objective findings.
+
+    Returns:
+        A dict that validates as PatientInput.
+    """
+    complaint = rng.choice(_COMPLAINTS)
+    return {
+        "pain_scale": rng.randint(0, 10),
+        "subjective": {
+            "chief_complaint": complaint,
+            "symptom_duration": rng.choice(_DURATIONS),
+            "symptom_description": f"{complaint} described as dull and aching",
+        },
+        "objective": {
+            "affected_region": rng.choice(_REGIONS),
+            "special_tests": [
+                f"{rng.choice(_TESTS)} {rng.choice(_RESULTS)}"
+                for _ in range(n_tests)
+            ],
+        },
+    }
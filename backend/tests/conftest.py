@@ -0,0 +1,86 @@
+"""Shared fixtures for PhysioMind backend tests.
+
+The web app and AI service are imported inside the fixtures that need
+them, so collecting model-only tests never loads the FastAPI layer.
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.models import DiagnosisResponse, PatientInput
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="run tests marked slow (the /analyze endpoint suites)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked ``slow`` unless --run-slow is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --run-slow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+async def _mock_analyze(self, patient_data: PatientInput) -> DiagnosisResponse:
+    return self._generate_mock_diagnosis(patient_data)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_diagnosis():
+    """Replace the Gemini-backed analysis with the mock diagnosis.
+    
+    API tests check routing and schemas, not model output, so the stub
+    is session-scoped to also cover module-scoped response fixtures.
+    Yields the real ``analyze`` so it can be restored where needed.
+    """
+    from app.services import DiagnosisService
+    
+    real_analyze = DiagnosisService.analyze
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(DiagnosisService, "analyze", _mock_analyze)
+        yield real_analyze
+
+
+@pytest.fixture(autouse=True)
+def real_diagnosis_for_integration(request, monkeypatch, stub_diagnosis):
+    """Restore the real AI service for tests marked ``integration``."""
+    if request.node.get_closest_marker("integration"):
+        from app.services import DiagnosisService
+        
+        monkeypatch.setattr(DiagnosisService, "analyze", stub_diagnosis)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Return a TestClient whose app lifespan spans the whole test session."""
+    from fastapi.testclient import TestClient
+    
+    from app.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture
+async def aclient():
+    """Return an async client that calls the app in-process via ASGI.
+    
+    ASGITransport does not run the lifespan, so it is entered here to
+    create the app's startup state.
+    """
+    from httpx import ASGITransport, AsyncClient
+    
+    from app.main import app
+    
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
@@ -0,0 +1,136 @@
+"""Tests for DiagnosisService streaming and response parsing."""
+
+import random
+
+import pytest
+
+from app.models import DiagnosisResponse, PatientInput, RiskLevel
+from app.services import DiagnosisService
+from tests._factories import PAYLOAD_SEED, make_patient
+
+
+_PATIENT = PatientInput.model_validate(make_patient(random.Random(PAYLOAD_SEED)))
+
+
+def _fake_gemini(chunks: list[str]):
+    """Return a _stream_gemini replacement that yields ``chunks``."""
+    async def stream_gemini(self, patient_data: PatientInput):
+        for chunk in chunks:
+            yield chunk
+    return stream_gemini
+
+
+@pytest.fixture
+def service():
+    """Return a DiagnosisService with a placeholder API key."""
+    service = DiagnosisService()
+    service.api_key = "test-key"
+    return service
+
+
+@pytest.fixture
+def diagnosis_chunks(service):
+    """Return a valid diagnosis JSON document split into three chunks."""
+    body = service._generate_mock_diagnosis(_PATIENT).model_dump_json()
+    third = len(body) // 3
+    return [body[:third], body[third:2 * third], body[2 * third:]]
+
+
+class TestAnalyzeStream:
+    """Tests for DiagnosisService.analyze_stream."""
+    
+    @pytest.mark.asyncio
+    async def test_progress_then_diagnosis(self, service, diagnosis_chunks, monkeypatch):
+        """Test that cumulative counts precede the parsed diagnosis."""
+        monkeypatch.setattr(DiagnosisService, "_stream_gemini", _fake_gemini(diagnosis_chunks))
+        
+        events = [event async for event in service.analyze_stream(_PATIENT)]
+        
+        lengths = [len(chunk) for chunk in diagnosis_chunks]
+        assert events[:-1] == [sum(lengths[:i + 1]) for i in range(len(lengths))]
+        assert isinstance(events[-1], DiagnosisResponse)
+        assert events[-1].primary_diagnosis
+    
+    @pytest.mark.asyncio
+    async def test_missing_api_key(self, service, monkeypatch):
+        """Test that a missing API key fails before Gemini is called."""
+        monkeypatch.setattr(DiagnosisService, "_stream_gemini", _fake_gemini(["{}"]))
+        service.api_key = None
+        
+        with pytest.raises(ValueError):
+            await anext(service.analyze_stream(_PATIENT))
+
+
+class TestCallGemini:
+    """Tests for DiagnosisService._call_gemini and response parsing."""
+    
+    @pytest.mark.asyncio
+    async def test_joins_chunks(self, service, diagnosis_chunks, monkeypatch):
+        """Test that streamed chunks are joined and validated."""
+        monkeypatch.setattr(DiagnosisService, "_stream_gemini", _fake_gemini(diagnosis_chunks))
+        
+        diagnosis = await service._call_gemini(_PATIENT)
+        assert diagnosis == DiagnosisResponse.model_validate_json("".join(diagnosis_chunks))
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "chunks",
+        [
+            pytest.param([], id="empty-response"),
+            pytest.param(['{"primary_diagnosis": '], id="truncated-json"),
+            pytest.param(['{"primary_diagnosis": "Strain"}'], id="schema-mismatch"),
+        ],
+    )
+    async def test_invalid_output_is_connection_error(self, service, chunks, monkeypatch):
+        """Test that unusable Gemini output surfaces as ConnectionError."""
+        monkeypatch.setattr(DiagnosisService, "_stream_gemini", _fake_gemini(chunks))
+        
+        with pytest.raises(ConnectionError):
+            await service._call_gemini(_PATIENT)
+
+
+class TestMockDiagnosisRiskFlags:
+    """Tests for the keyword risk-flag scan in the mock diagnosis."""
+    
+    @pytest.mark.parametrize(
+        "symptoms,expected",
+        [
+            pytest.param("Pain wakes me at night", [(RiskLevel.RED, "night")], id="night"),
+            pytest.param("Pain overnight", [(RiskLevel.RED, "night")], id="overnight"),
+            pytest.param("Wakes at midnight", [(RiskLevel.RED, "night")], id="midnight"),
+            pytest.param("Recent Fever and chills", [(RiskLevel.RED, "fever")], id="fever"),
+            pytest.param("Bladder changes", [(RiskLevel.RED, "bladder")], id="bladder"),
+            pytest.param(
+                "Unexplained weight   loss", [(RiskLevel.RED, "weight loss")], id="weight-loss"
+            ),
+            pytest.param("Fear of bending", [(RiskLevel.YELLOW, None)], id="fear"),
+            pytest.param(
+                "Catastrophizing about pain", [(RiskLevel.YELLOW, None)], id="catastrophizing"
+            ),
+            pytest.param("Dull ache after sitting", [], id="neutral"),
+        ],
+    )
+    def test_keyword_flags(self, service, symptoms, expected):
+        """Test that symptom keywords raise the expected flags."""
+        payload = make_patient(random.Random(PAYLOAD_SEED))
+        payload["pain_scale"] = 3
+        payload["subjective"]["symptom_description"] = symptoms
+        patient = PatientInput.model_validate(payload)
+        
+        flags = service._generate_mock_diagnosis(patient).risk_flags
+        
+        assert [flag.level for flag in flags] == [level for level, _ in expected]
+        for flag, (_, term) in zip(flags, expected):
+            if term:
+                assert f"({term})" in flag.description
+    
+    def test_red_flag_description_is_bounded(self, service):
+        """Test that a long matched word is not copied into the flag."""
+        payload = make_patient(random.Random(PAYLOAD_SEED))
+        payload["pain_scale"] = 3
+        payload["subjective"]["symptom_description"] = "night" + "s" * 1500
+        patient = PatientInput.model_validate(payload)
+        
+        (flag,) = service._generate_mock_diagnosis(patient).risk_flags
+        assert "(night)" in flag.description
+        assert len(flag.description) <= 500
@@ -0,0 +1,43 @@
+"""Performance floor for PatientInput validation.
+
+The default ``pytest`` run measures these and enforces the floor.
+pytest-benchmark turns itself off for ``--benchmark-disable`` and when
+xdist's ``--dist`` is given without workers; the tests then report as
+skipped rather than passing unchecked.
+"""
+
+import random
+
+import orjson
+import pytest
+
+from app.models import PatientInput
+from tests._factories import PAYLOAD_SEED, make_patient
+
+
+# Roughly 15x the current ~6µs mean: far above noise, but a regex-heavy
+# validator added to PatientInput would cross it.
+MAX_MEAN_SECONDS = 100e-6
+
+_PAYLOAD = make_patient(random.Random(PAYLOAD_SEED))
+_BODY = orjson.dumps(_PAYLOAD)
+
+
+def _assert_mean_below_floor(benchmark):
+    if benchmark.stats is None:
+        pytest.skip("benchmarks disabled (xdist active or --benchmark-disable)")
+    assert benchmark.stats.stats.mean < MAX_MEAN_SECONDS
+
+
+def test_patient_input_init_perf(benchmark):
+    """Benchmark validating PatientInput from a Python dict."""
+    patient = benchmark(PatientInput.model_validate, _PAYLOAD)
+    assert patient.pain_scale == _PAYLOAD["pain_scale"]
+    _assert_mean_below_floor(benchmark)
+
+
+def test_patient_input_json_perf(benchmark):
+    """Benchmark validating PatientInput from raw JSON bytes."""
+    patient = benchmark(PatientInput.model_validate_json, _BODY)
+    assert patient.pain_scale == _PAYLOAD["pain_scale"]
+    _assert_mean_below_floor(benchmark)